@@ -10,6 +10,7 @@ On initialisation, the FolderProcessor instance creates a FileProcessor object f
 Example 1 shows how the TFP module can be used to create one output file per input file.
 All files in the 'data' folder are read as input (using the argument "infolder = 'data'" for the instance of tfp.FolderProcessor).
 The process_data() method of this class is quite simple: it just appends a line of text to the end of the file via the add_final_line() method.
+The input is read with tfp.FileProcessor's get_input_lines() method, which passes on one line at a time rather than reading the whole file into a list.
 Because the generate_output_filename() method is overridden in this class, the file names in the output folder are different from those in the input folder.
 (The default behaviour is for filenames to be the same in both folders.)
 Note that unless the argument "overwrite = True" is supplied when instantiating tfp.FolderProcessor, existing files in the output folder will not be overwritten if the script is run again.
@@ -18,14 +19,20 @@ Because the 'outfolder' argument for the instance of tfp.FolderManager is set to
 Example 2 shows how the module can be used to create a single summary file for a set of input files.
 This is achieved by specifying the 'outfile' argument when creating an instance of tfp.FolderProcessor (in this case, its value is 'example_output/averages.csv').
 The process_data() method of the CalculateAveragesFromCSV class is a bit more substantial in this example; it calls a couple of methods:
-the first of these splits the input csv file into a list that contains one list for each column in the input file,
-the second method calculates the average for each list of column values.
+the first of these makes a single pass over the rows yielded one at a time by tfp.FileProcessor's get_csv_input() method, keeping a running total and count of the numeric values in each column,
+the second method calculates the average for each column from these totals.
 
 Example 3 shows how the module can be used to output text to the terminal via print commands.
 This is useful for a quick summary of the input files.
-In this case, the GrepData class uses tfp.FileProcessor's built-in grep_data() method to look for the string '#2' in the input files.
+In this case, the GrepData class uses tfp.FileProcessor's built-in grep_string() method to look for the string '#2' in the input files.
+The search string is supplied as the 'greppattern' argument of tfp.FolderProcessor, which prepares it once for all of the files.
+(A plain string like this one is searched for literally; to search for a regular expression, pass re.compile(b'...') as the greppattern instead.
+The pattern is compiled from bytes because the memory-mapped input from get_input_buffer() is bytes rather than text.)
+The input is read with get_input_buffer() rather than get_input_data(), so grep_string() searches each file in a single pass without splitting it into lines.
 """
 
+import itertools
+
 # text_file_processing.py needs to be in the same folder as this file
 import text_file_processing as tfp
 
@@ -39,7 +46,7 @@ class AppendAndRename(tfp.FileProcessor):
 
     def process_data(self):
         """The function called by FolderManager"""
-        inputdata = self.get_input_data()
+        inputdata = self.get_input_lines()
         updateddata = self.add_final_line(inputdata)
         self.write_data_to_file(updateddata)
 
@@ -49,9 +56,10 @@ class AppendAndRename(tfp.FileProcessor):
         return filename + '-updated.' + extension
 
     def add_final_line(self, dataset):
-        """Adds a line of text to the input dataset (should be a list)"""
+        """Adds a line of text to the end of the input dataset (can be a list or an iterator of lines)"""
         finalline = 'This line was added by the AppendAndRename class'
-        return dataset + [finalline]
+        # chain() passes the lines on as they are read, so the whole file is never held in memory
+        return itertools.chain(dataset, [finalline])
 
 
 example1 = tfp.FolderProcessor(infolder = 'data', outfolder = 'example_output', ProcessObject = AppendAndRename, overwrite = True)
@@ -66,39 +74,36 @@ class CalculateAveragesFromCSV(tfp.FileProcessor):
 
     def process_data(self):
         """The function called by FolderManager"""
-        inputdata = self.get_input_data()
-        ordereddata = self.group_csv_data(inputdata)
-        averages = self.calculate_csv_averages(ordereddata)
+        inputdata = self.get_csv_input()
+        totals, counts = self.sum_csv_columns(inputdata)
+        averages = self.calculate_csv_averages(totals, counts)
         self.write_data_to_file(averages)
 
-    def group_csv_data(self, dataset):
-        result = []
-        for line in dataset:
-            data = line.split(',')
+    def sum_csv_columns(self, dataset):
+        """Returns the running total and the number of numeric values for each column in a single pass over the data"""
+        totals = []
+        counts = []
+        for data in dataset:
+            # Add columns as they are found: rows do not all have to be the same length
+            while len(totals) < len(data):
+                totals.append(0.0)
+                counts.append(0)
             for i in range(len(data)):
                 try:
-                    result[i].append(data[i])
-                except IndexError:
-                    result.append([data[i]])
-                    assert result[i][-1] == data[i]
-        #print(result)
-        return result
-
-    def calculate_csv_averages(self, dataset):
-        result = 'Averages for {0},'.format(self.filename)
-        for subdataset in dataset:
-            total = 0
-            count = 0
-            for value in subdataset:
-                try:
-                    total += float(value.strip())
-                    count +=1
+                    # float() ignores surrounding whitespace (including the newline character)
+                    totals[i] += float(data[i])
+                    counts[i] += 1
                 except ValueError:
                     pass
-            result += str(total / count) + ',' if count else 'NaN,'
-        # Strip out the trailing comma and end the line with a newline character
-        result = result[:-1] + '\n'
-        return result
+        return totals, counts
+
+    def calculate_csv_averages(self, totals, counts):
+        """Returns a line of csv text containing the filename and the average for each column"""
+        # Collect the values in a list and join them once at the end, rather than adding to a string each time
+        result = ['Averages for {0}'.format(self.filename)]
+        for i in range(len(totals)):
+            result.append(str(totals[i] / counts[i]) if counts[i] else 'NaN')
+        return ','.join(result) + '\n'
 
 
 example2 = tfp.FolderProcessor(infolder = 'data', ProcessObject = CalculateAveragesFromCSV, outfile = 'example_output/averages.csv')
@@ -112,9 +117,9 @@ class GrepData(tfp.FileProcessor):
         super(GrepData, self).__init__(infolder, outfolder, filename, outfile, additional_args)
 
     def process_data(self):
-        inputdata = self.get_input_data()
-        self.grep_string('#2', inputdata)
+        inputdata = self.get_input_buffer()
+        self.grep_string(self.greppattern, inputdata)
 
 
-example3 = tfp.FolderProcessor(infolder = 'data', ProcessObject = GrepData, verbose = False)
+example3 = tfp.FolderProcessor(infolder = 'data', ProcessObject = GrepData, verbose = False, greppattern = '#2')
 
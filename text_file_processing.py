@@ -4,6 +4,21 @@
 # v4.3 (Nov 2021) Generate objects now compares the output filename against the list of files to not to overwrite
 #                 Otherwise, overwrite mode does not work if InOut.generate_output_filename() is overridden
 # v4.4 (Nov 2021) Added the grep_string() method to FileProcessor to add grep-like functionality
+# v4.5 (Oct 2026) Added the get_csv_input() method to FileProcessor to read csv files with the (C-based) csv module
+# v4.6 (Oct 2026) Added the get_input_buffer() method to FileProcessor to memory-map the infile; write_data_to_file() now accepts bytes
+# v4.7 (Oct 2026) grep_string() can now search a buffer from get_input_buffer() in a single pass, without splitting it into lines
+# v4.8 (Oct 2026) grep_string() now also accepts a compiled regular expression, e.g. to search for several strings in one pass
+# v4.9 (Oct 2026) Added a processes argument to FolderProcessor to process files in parallel (python 3 only)
+# v4.10 (Oct 2026) Generate objects now lists the outfolder once (and only if needed) and checks it with a set
+# v4.11 (Oct 2026) write_data_to_file() now writes a string in one call and a list of lines with writelines()
+# v4.12 (Oct 2026) FolderProcessor now keeps the summary file open rather than each object reopening it in append mode
+# v4.13 (Oct 2026) Added get_output_filename() to FileProcessor so that generate_output_filename() is only called once per file
+# v4.14 (Oct 2026) Added a greppattern argument to FolderProcessor: the search string (or compiled regular expression) is prepared once and shared with every object
+# v4.15 (Oct 2026) Added a cachefolder argument to FolderProcessor: output files are cached and reused if the input file has not changed
+# v4.16 (Oct 2026) Added the copy_input_file() method to FileProcessor for subclasses that do not change the contents of a file
+# v4.17 (Oct 2026) Added the get_input_lines() method to FileProcessor to read the infile one line at a time; grep_string() accepts its output
+# v4.18 (Oct 2026) Added a threads argument to FolderProcessor to overlap the reading and writing of files (python 3 only)
+# v4.19 (Oct 2026) Added get_output_path() to FileProcessor so that the output path is only built once per file
 
 # The processing function should be a subclass of InOut and should have a process_data function
 # This function can either output text to the terminal (e.g. file-checking)
@@ -12,17 +27,65 @@
 # Remember that module names cannot include dashes! (Use underscores instead.)
 
 
+import csv
+import hashlib
+import mmap
 import os
+import re
+import shutil
+import sys
+import tempfile
+
+# The permissions for new output files: os.umask() can only be read by changing it, so this is done once, on import
+# (see FileProcessor.write_data_to_file, whose temporary files are otherwise only readable by their owner)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+def replace_file(source, destination):
+    """Renames the source file to the destination, replacing the destination if it already exists"""
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        # os.replace() is not available in python 2.x, and os.rename() does not replace an existing file on Windows
+        if (os.name == 'nt') and os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
+
+def get_buffer_needle(string, textbuffer = False):
+    """Converts a search string or compiled regular expression into the form that FileProcessor.grep_buffer() searches for"""
+    # A bytes buffer (e.g. from get_input_buffer) can only be searched with bytes, or a regular expression compiled from bytes
+    if hasattr(string, 'search'):
+        # A str regular expression is not converted: compiled from bytes instead it could match differently (e.g. for \w or non-ASCII characters)
+        if (not textbuffer) and (not isinstance(string.pattern, bytes)):
+            raise TypeError('a regular expression compiled from a str cannot search a bytes buffer: compile it from bytes instead, e.g. re.compile(b\'...\')')
+        # re.MULTILINE lets ^ and $ match at the start and end of every line, as they do when searching a list of lines
+        return re.compile(string.pattern, string.flags | re.MULTILINE)
+    # A plain string is encoded as UTF-8: a UTF-8 buffer contains its bytes exactly where the decoded text contains the string
+    if textbuffer or isinstance(string, bytes):
+        return string
+    return string.encode('utf-8')
 
 class FileProcessor(object):
     """Defines the input and output information for data processing subclasses"""
     def __init__(self, infolder, outfolder, filename, outfile, additional_args):
-        self.inpath = infolder + '/' + filename
+        self.inpath = os.path.join(infolder, filename)
         self.outfolder = outfolder
         self.filename = filename
         self.outfile = outfile
         self.additional_args = additional_args
         self.statusverbose = None
+        # FolderProcessor sets this to the open summary file, if there is one (see write_data_to_file)
+        self.summaryfile = None
+        # Set by get_output_filename() and get_output_path() the first time they are called
+        self.outputfilename = None
+        self.outputpath = None
+        # Set to True once this object has written its own output file (FolderProcessor only caches output files written this way)
+        self.outputwritten = False
+        # Set by FolderProcessor.copy_from_cache() to the path of this object's cached output, if it is using a cache folder
+        self.cachepath = None
+        # FolderProcessor sets these to its greppattern and the form of it used to search bytes buffers, if there is one (for use with grep_string)
+        self.greppattern = None
+        self.greppatternbuffer = None
 
     def get_input_data(self):
         """Opens the infile and returns a list of its lines (works for python 2.x)"""
@@ -31,24 +94,112 @@ class FileProcessor(object):
         filedata.close()
         return result
 
+    def get_input_lines(self):
+        """Opens the infile and yields its lines one at a time, rather than reading the whole file into a list"""
+        # The file is closed once all of the lines have been read
+        # The lines can be passed straight to write_data_to_file(), which only replaces the output file once they have all been written
+        filedata = open(self.inpath, 'r')
+        try:
+            for line in filedata:
+                yield line
+        finally:
+            filedata.close()
+
+    def get_csv_input(self, delimiter = ','):
+        """Opens the infile and yields its rows one at a time, each as a list of the values in that row"""
+        # The csv module splits the lines in C, which is much faster than calling split() on each line
+        # The rows are not collected into a list, so only one row is held in memory at a time
+        # The csv module needs the file opened with newline='' (binary mode for python 2.x) so that quoted values can contain newlines
+        if sys.version_info[0] < 3:
+            filedata = open(self.inpath, 'rb')
+        else:
+            filedata = open(self.inpath, 'r', newline = '')
+        try:
+            for row in csv.reader(filedata, delimiter = delimiter):
+                yield row
+        finally:
+            filedata.close()
+
+    def get_input_buffer(self):
+        """Maps the infile into memory and returns it as a read-only bytes-like buffer"""
+        # Unlike get_input_data(), this does not create a separate string for each line of the file
+        filedata = open(self.inpath, 'rb')
+        if os.fstat(filedata.fileno()).st_size:
+            result = mmap.mmap(filedata.fileno(), 0, access = mmap.ACCESS_READ)
+        else:
+            # An empty file cannot be mapped
+            result = b''
+        # The mapping remains valid after the file is closed
+        filedata.close()
+        return result
+
     def write_data_to_file(self, dataset):
         """Opens the outfile and writes the contents of dataset to the file (works for python 2.x)"""
-        if self.outfile:
+        # Bytes (e.g. the buffer from get_input_buffer()) are written in binary mode in a single call
+        isbytes = isinstance(dataset, (bytes, mmap.mmap))
+        closetarget = True
+        temppath = None
+        if self.outfile and self.summaryfile and (not isbytes):
+            # Case for a single summary file that FolderProcessor has already opened, so write to it directly
+            outtarget = self.summaryfile
+            closetarget = False
+        elif self.outfile:
             # Case for a single summary file, so need to append data
-            outtarget = open(self.outfile, 'a')
+            if self.summaryfile:
+                # Bytes need a binary mode file: make sure earlier results reach the file first
+                self.summaryfile.flush()
+            outtarget = open(self.outfile, 'ab' if isbytes else 'a')
         else:
             # One file for each input file, so use write mode
-            outputfilepath = self.outfolder + '/' + self.generate_output_filename()
-            outtarget = open(outputfilepath, 'w')
-        for line in dataset:
-            outtarget.write(line)
-        # Close the file in either case: data will be appended if it's a summary file
-        outtarget.close()
+            # Write to a temporary file and only rename it to the output filename once it is complete:
+            # if the dataset is read as it is written (e.g. from get_input_lines) an error must not leave a partial output file behind
+            # mkstemp() gives each temporary file a unique name, even when several threads are writing to the outfolder
+            tempfd, temppath = tempfile.mkstemp(suffix = '.tmp', prefix = '.' + self.get_output_filename() + '.', dir = self.outfolder)
+            outtarget = os.fdopen(tempfd, 'wb' if isbytes else 'w')
+        completed = False
+        try:
+            try:
+                if isbytes or isinstance(dataset, str):
+                    # Write a single string in one call, rather than one character at a time
+                    outtarget.write(dataset)
+                else:
+                    # writelines() loops over the lines in C rather than calling write() for each line
+                    outtarget.writelines(dataset)
+            finally:
+                # Close the file unless it is the summary file held open by FolderProcessor
+                if closetarget:
+                    outtarget.close()
+            if temppath:
+                os.chmod(temppath, 0o666 & ~UMASK)
+                replace_file(temppath, self.get_output_path())
+                self.outputwritten = True
+            completed = True
+        finally:
+            # Remove the temporary file if anything went wrong (including renaming it)
+            if temppath and (not completed) and os.path.exists(temppath):
+                os.remove(temppath)
+
+    def copy_input_file(self):
+        """Copies the infile to the output without reading it into python"""
+        if self.outfile:
+            # Case for a single summary file: make sure earlier results reach the file first, then append to it
+            if self.summaryfile:
+                self.summaryfile.flush()
+            infile = open(self.inpath, 'rb')
+            outtarget = open(self.outfile, 'ab')
+            shutil.copyfileobj(infile, outtarget)
+            outtarget.close()
+            infile.close()
+        else:
+            # copyfile() lets the operating system copy the data where it can (e.g. with sendfile on Linux)
+            shutil.copyfile(self.inpath, self.get_output_path())
+            self.outputwritten = True
 
     def process_data(self):
         """Prints the filename - this method should be overridden by the subclass"""
         # If self.get_input_data() is required call it here so that the file reading is performed inside FolderManager's try/except block
         # If writing data to one file for each input file, this method should populate a dataset (typically a list of strings) and then call self.write_data_to_file(dataset)
+        # If the contents of the file do not need to change (e.g. it is only being renamed), call self.copy_input_file() instead
         # Alternatively, it can use print() to output text to the terminal
         print(self.filename)
 
@@ -57,23 +208,131 @@ class FileProcessor(object):
         # The subclass should override this method if the output filenames are to be different from the input filenames
         return self.filename
 
+    def get_output_filename(self):
+        """Returns the output filename, only calling generate_output_filename() the first time"""
+        # FolderProcessor needs the output filename before processing (to check for existing files) and write_data_to_file() needs it again
+        if self.outputfilename is None:
+            self.outputfilename = self.generate_output_filename()
+        return self.outputfilename
+
+    def get_output_path(self):
+        """Returns the path of the output file in the outfolder, only building it the first time"""
+        if self.outputpath is None:
+            self.outputpath = os.path.join(self.outfolder, self.get_output_filename())
+        return self.outputpath
+
     def grep_string(self, string, dataset, printdata = True):
         """Searches for a string in the lines of a dataset, and prints or returns the results"""
-        matches = []
-        for i in range(len(dataset)):
-            if string in dataset[i]:
-                matches.append(i)
+        # The dataset can either be a single buffer (see get_input_buffer) or a list or iterator of lines (see get_input_data and get_input_lines)
+        # The string can also be a compiled regular expression: to search for several strings at once use re.compile('first|second')
+        # A bytes buffer (e.g. from get_input_buffer) needs a regular expression compiled from bytes (re.compile(b'first|second')),
+        # which matches bytes rather than characters and does not treat \r\n line endings as \n (unlike text read with get_input_data)
+        # Regular expressions are matched against one line at a time (avoid \A and \Z: these only match at the start and end of a whole buffer)
+        if isinstance(dataset, (str, bytes, mmap.mmap)):
+            matches, matchedlines = self.grep_buffer(string, dataset)
+        else:
+            matches = []
+            matchedlines = []
+            # Decide between a regular expression and a plain string once, rather than for every line
+            if hasattr(string, 'search'):
+                for i, line in enumerate(dataset):
+                    if string.search(line):
+                        matches.append(i)
+                        matchedlines.append(line)
+            else:
+                for i, line in enumerate(dataset):
+                    if string in line:
+                        matches.append(i)
+                        matchedlines.append(line)
         if printdata:
-            for match in matches:
-                print('String "{0}" found on line {1} in file {2}: ("{3}")'.format(string, match + 1, self.filename, dataset[match].strip('\n')))
+            label = string.pattern if hasattr(string, 'search') else string
+            if not isinstance(label, str):
+                label = label.decode('utf-8', 'replace')
+            for match, line in zip(matches, matchedlines):
+                if not isinstance(line, str):
+                    line = line.decode('utf-8', 'replace')
+                print('String "{0}" found on line {1} in file {2}: ("{3}")'.format(label, match + 1, self.filename, line.strip('\n')))
         else:
             # Add the filename so that it is clear which file the matches were found in
             result = [self.filename] + matches
             return result
 
+    def grep_buffer(self, string, buffer):
+        """Returns the indices and the contents of the lines in a buffer that contain a string (or match a regular expression)"""
+        # Search the whole buffer at once and only work out line numbers for the matches
+        textbuffer = isinstance(buffer, str)
+        if (string is self.greppattern) and (self.greppatternbuffer is not None) and (not textbuffer):
+            # FolderProcessor has already converted its greppattern for searching bytes buffers
+            needle = self.greppatternbuffer
+        else:
+            needle = get_buffer_needle(string, textbuffer)
+        newline = '\n' if textbuffer else b'\n'
+        matches = []
+        matchedlines = []
+        lineindex = 0
+        linestart = 0
+        position = self.find_in_buffer(needle, buffer, 0)
+        while position != -1:
+            # A match at the very end of the buffer is not on any line if the last line ends with a newline (or there are no lines)
+            if (position == len(buffer)) and ((not buffer) or (buffer[-1:] == newline)):
+                break
+            # Count the newlines since the start of the previous matching line, without copying that part of the buffer
+            if isinstance(buffer, mmap.mmap):
+                # mmap has no count() method, so count() slices of up to 1 MiB: this runs in C and only copies 1 MiB at a time
+                chunksize = 1 << 20
+                newlines = 0
+                for chunkstart in range(linestart, position, chunksize):
+                    newlines += buffer[chunkstart:min(chunkstart + chunksize, position)].count(newline)
+            else:
+                newlines = buffer.count(newline, linestart, position)
+            if newlines:
+                lineindex += newlines
+                linestart = buffer.rfind(newline, linestart, position) + 1
+            lineend = buffer.find(newline, position)
+            if lineend == -1:
+                lineend = len(buffer)
+            # A regular expression match that runs on past the end of the line (e.g. o\s+b) does not count,
+            # so check the line on its own (including its newline, as in a list of lines from get_input_data)
+            if (not hasattr(needle, 'search')) or needle.search(buffer, linestart, lineend + 1):
+                matches.append(lineindex)
+                matchedlines.append(buffer[linestart:lineend])
+            # Each line is only reported once, so carry on searching from the start of the next line (if there is one)
+            if lineend + 1 >= len(buffer):
+                break
+            position = self.find_in_buffer(needle, buffer, lineend + 1)
+        return matches, matchedlines
+
+    def find_in_buffer(self, needle, buffer, start):
+        """Returns the position of the first match for needle (a string or a compiled regular expression) at or after start, or -1"""
+        if hasattr(needle, 'search'):
+            match = needle.search(buffer, start)
+            return match.start() if match else -1
+        return buffer.find(needle, start)
+
+def run_process_object(processobject):
+    """Calls an object's process_data method and returns whether it succeeded, a comment on how it went and whether it wrote an output file"""
+    # This is a module-level function so that it can be sent to worker processes (see FolderProcessor.process_folder)
+    try:
+        processobject.process_data()
+        succeeded = True
+        if processobject.statusverbose:
+            comment = processobject.statusverbose
+        else:
+            # If the processing object has no comment attribute, verbose mode just prints "Processed file ... filename ... OK"
+            comment = '\t... OK'
+    except Exception as e:
+        succeeded = False
+        comment = failure_comment(e)
+    # outputwritten is returned because changes to the object's attributes are lost if it was processed in a worker process
+    return succeeded, comment, processobject.outputwritten
+
+def failure_comment(e):
+    """Returns the comment reported for a file when processing it raises an exception"""
+    return '\t... FAILED: {0} [{1}]'.format(e, e.__class__)
+
 class FolderProcessor(object):
     """Runs an object's process_data function on all files in a folder"""
-    def __init__(self, infolder = "input", outfolder = "output", ProcessObject = FileProcessor, verbose = True, outfile = None, overwrite = False, **additional_args):
+    def __init__(self, infolder = "input", outfolder = "output", ProcessObject = FileProcessor, verbose = True, outfile = None, overwrite = False, processes = 1, threads = 1, greppattern = None, cachefolder = None, **additional_args):
         # Default behaviour is each file in ./input is processed with the ProcessObject and the results are saved in a file (with the same name as the input file) in ./output
         self.infolder = infolder
         self.outfolder = outfolder
@@ -86,9 +345,31 @@ class FolderProcessor(object):
             # Add a header in write mode now to overwrite any previous files
             fileObj = open(outfile, 'w')
             fileObj.write('Summary of results:\n\n')
-            # Close now: InOut will append data
+            # Close now: process_folder reopens the file in append mode while the objects are processed
             fileObj.close()
+        self.summaryfile = None
         self.overwrite = overwrite
+        # If processes is more than 1, the files are shared between this many worker processes (see process_folder)
+        self.processes = processes
+        # Alternatively, if threads is more than 1, the files are shared between this many threads (see get_executor)
+        self.threads = threads
+        # A regular expression for grep_string() is compiled once here, rather than once for every file
+        # A plain string is searched for as it is - pass a compiled regular expression (from re.compile) to search for a pattern
+        self.greppattern = greppattern
+        # The form used to search bytes buffers (see get_buffer_needle) is prepared once here, rather than once for every file
+        self.greppatternbuffer = None
+        if greppattern is not None:
+            try:
+                self.greppatternbuffer = get_buffer_needle(greppattern)
+            except TypeError:
+                # A regular expression compiled from a str can still search lists of lines - grep_buffer() reports the error for bytes buffers
+                pass
+        # If a cachefolder is supplied, a copy of each output file is kept there and reused while the input file is unchanged
+        # Only used when writing one output file per input file (not for a summary file or output to the terminal)
+        # The cache does not know about changes to the ProcessObject's code, so empty the folder after making any
+        self.cachefolder = cachefolder
+        if self.cachefolder and (not os.path.isdir(self.cachefolder)):
+            os.makedirs(self.cachefolder)
         # It is left to subclasses of InOut to test for additional args and use as required
         self.additional_args = additional_args
         # If called without any arguments, this class will list the files in "./input"
@@ -101,24 +382,22 @@ class FolderProcessor(object):
     def generate_objects(self):
         """Generates a data processing object for each file in the infolder"""
         result = []
-        # Create a list of files not to overwrite (not relevant if writing to a summary file)
-        # For output to terminal mode, the outfolder will likely not exist - don't want an OSError to halt the script
-        try:
-            os.listdir(self.outfolder)
-            isoutfolder = True
-        except OSError:
-            isoutfolder = False
-        #print('{0}, {1}, {2}'.format(not self.overwrite, not self.outfile, isoutfolder))
-        if ((not self.overwrite) and (not self.outfile) and (isoutfolder)):
-            preservelist = os.listdir(self.outfolder)
-            #print(preservelist)
-        else:
-            preservelist = []
+        # Create a set of files not to overwrite (not relevant if writing to a summary file)
+        # A set is used so that checking each output filename does not mean searching a list of the whole outfolder
+        preserveset = set()
+        if (not self.overwrite) and (not self.outfile):
+            # For output to terminal mode, the outfolder will likely not exist - don't want an OSError to halt the script
+            try:
+                preserveset = set(os.listdir(self.outfolder))
+            except OSError:
+                pass
         for eachfile in self.fileslist:
             newProcessObject = self.ProcessObject(self.infolder, self.outfolder, eachfile, self.outfile, self.additional_args)
+            newProcessObject.greppattern = self.greppattern
+            newProcessObject.greppatternbuffer = self.greppatternbuffer
             # Need to check output filename (not input filename!) to see if the output file already exists
-            outputfile = newProcessObject.generate_output_filename() 
-            if outputfile in preservelist:
+            outputfile = newProcessObject.get_output_filename()
+            if outputfile in preserveset:
                 print('Output already exists for {0} ... ignoring this file'.format(eachfile))
             else:
                 result.append(newProcessObject)
@@ -126,20 +405,125 @@ class FolderProcessor(object):
 
     def process_folder(self):
         """Calls the process_data method for each of the data processing objects in self.objectlist"""
-        for eachobject in self.objectlist:
-            # Start by running the object's process_data function
+        if self.outfile:
+            # Open the summary file once for all of the objects, rather than each object reopening it
+            # (Append mode means that anything written to the file via another file object will not be overwritten)
+            self.summaryfile = open(self.outfile, 'a')
+            for eachobject in self.objectlist:
+                eachobject.summaryfile = self.summaryfile
+        try:
+            # Objects whose output is already in the cache folder do not need to be processed again
+            pendinglist = []
+            for eachobject in self.objectlist:
+                try:
+                    if self.copy_from_cache(eachobject):
+                        self.report_status(eachobject, '\t... OK (copied from cache)')
+                    else:
+                        pendinglist.append(eachobject)
+                except Exception as e:
+                    # As in run_process_object, a problem with one file should not halt the script
+                    self.report_status(eachobject, failure_comment(e))
+            executor = self.get_executor()
+            if executor:
+                with executor:
+                    # Objects are submitted one at a time, so that a problem in the pool itself only fails the objects it affects
+                    # (e.g. an object that cannot be pickled to send to a worker process, or a worker process that dies)
+                    futures = []
+                    for eachobject in pendinglist:
+                        try:
+                            futures.append(executor.submit(run_process_object, eachobject))
+                        except Exception as e:
+                            futures.append(e)
+                    # Report the results in the same order as pendinglist
+                    for eachobject, future in zip(pendinglist, futures):
+                        if isinstance(future, Exception):
+                            result = (False, failure_comment(future), False)
+                        else:
+                            try:
+                                result = future.result()
+                            except Exception as e:
+                                result = (False, failure_comment(e), False)
+                        self.record_result(eachobject, result)
+            else:
+                for eachobject in pendinglist:
+                    self.record_result(eachobject, run_process_object(eachobject))
+            if self.verbose:
+                print(' ')
+        finally:
+            # The summary file is only kept open while the objects are processed
+            if self.summaryfile:
+                self.summaryfile.close()
+                self.summaryfile = None
+                for eachobject in self.objectlist:
+                    eachobject.summaryfile = None
+
+    def get_executor(self):
+        """Returns a pool of worker processes or threads to share the objects between, or None if they are to be processed in turn"""
+        # Each object works on its own file, so the objects can be processed in parallel
+        # Not used with a summary file: the objects would race to append to it and the order of the results could change
+        if self.outfile:
+            return None
+        if self.processes > 1:
+            # Any changes that process_data makes to an object's attributes stay in the worker process
+            # Scripts that use this must start with "if __name__ == '__main__':" if worker processes are not forked (e.g. Windows)
+            from concurrent.futures import ProcessPoolExecutor
+            return ProcessPoolExecutor(max_workers = self.processes)
+        if self.threads > 1:
+            # Threads suit objects that spend most of their time reading and writing files (python lets other threads run while one waits)
+            from concurrent.futures import ThreadPoolExecutor
+            return ThreadPoolExecutor(max_workers = self.threads)
+        return None
+
+    def record_result(self, processobject, result):
+        """Caches the output file written by an object that was processed successfully and reports on how it went"""
+        succeeded, comment, outputwritten = result
+        # Only cache an output file that the object wrote during this run - any other file at its output path may be out of date
+        if succeeded and outputwritten:
             try:
-                eachobject.process_data()
-                if eachobject.statusverbose:
-                    comment = eachobject.statusverbose
-                else:
-                    # If the processing object has no comment attribute, verbose mode just prints "Processed file ... filename ... OK"
-                    comment = '\t... OK'
+                self.save_to_cache(processobject)
             except Exception as e:
-                comment = '\t... FAILED: {0} [{1}]'.format(e, e.__class__)               
-            # default is self.verbose = True
-            if self.verbose:
-                print('Processing file ... {0} {1}'.format(eachobject.filename, comment))
-        if self.verbose:
-            print(' ')
+                comment = failure_comment(e)
+        self.report_status(processobject, comment)
 
+    def get_cache_path(self, processobject):
+        """Returns the path of the cached output for an object, or None if it cannot be cached"""
+        if (not self.cachefolder) or self.outfile:
+            return None
+        try:
+            stat = os.stat(processobject.inpath)
+        except OSError:
+            return None
+        # The name changes if the input file is modified, or if it is processed by a different class
+        # The digest separates classes with the same name in different modules, files with the same name in different folders and runs with different settings
+        processclass = processobject.__class__
+        source = '{0}.{1}\n{2}\n{3!r}'.format(processclass.__module__, getattr(processclass, '__qualname__', processclass.__name__), os.path.abspath(processobject.inpath), sorted(processobject.additional_args.items()))
+        if not isinstance(source, bytes):
+            source = source.encode('utf-8')
+        digest = hashlib.md5(source).hexdigest()
+        # st_mtime_ns is not available in python 2.x
+        mtime = getattr(stat, 'st_mtime_ns', None) or repr(stat.st_mtime)
+        cachename = '{0}-{1}-{2}-{3}-{4}'.format(processclass.__name__, processobject.filename, digest, mtime, stat.st_size)
+        return os.path.join(self.cachefolder, cachename)
+
+    def copy_from_cache(self, processobject):
+        """Copies an object's cached output (if there is one) to the outfolder and returns True if it did so"""
+        # The cache path is worked out once, before the object is processed, and kept for save_to_cache():
+        # if the input file changes during processing, the output must not be saved under the new version's name
+        cachepath = self.get_cache_path(processobject)
+        processobject.cachepath = cachepath
+        if cachepath and os.path.isfile(cachepath):
+            # copyfile() lets the operating system copy the data where it can (e.g. with sendfile on Linux)
+            shutil.copyfile(cachepath, processobject.get_output_path())
+            return True
+        return False
+
+    def save_to_cache(self, processobject):
+        """Copies an object's output file to the cache folder, using the cache path found before it was processed"""
+        if processobject.cachepath:
+            shutil.copyfile(processobject.get_output_path(), processobject.cachepath)
+
+    def report_status(self, processobject, comment):
+        """Prints a comment on the processing of a file to the terminal (if in verbose mode)"""
+        # default is self.verbose = True
+        if self.verbose:
+            print('Processing file ... {0} {1}'.format(processobject.filename, comment))